@@ -400,10 +400,6 @@ if ! check_python_module "gi"; then
     MISSING_DEPS+=("python-gobject")
 fi
 
-if ! check_python_module "PIL"; then
-    MISSING_DEPS+=("pillow")
-fi
-
 if ! check_python_module "numpy"; then
     MISSING_DEPS+=("numpy")
 fi
@@ -413,7 +409,7 @@ if [ ${#MISSING_DEPS[@]} -gt 0 ]; then
     for dep in "${MISSING_DEPS[@]}"; do
         echo "  - $dep"
     done
-    echo -e "\n${YELLOW}Install with: pip install --user pillow numpy${NC}"
+    echo -e "\n${YELLOW}Install with: pip install --user numpy${NC}"
 else
     echo -e "${GREEN}✓ All Python dependencies installed${NC}"
 fi
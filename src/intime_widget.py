@@ -16,100 +16,201 @@ CDLL('libgtk4-layer-shell.so')
 import gi
 import json
 import argparse
-import re
+import errno
 import math
-import random
+from math import sin
 import socket
 import signal
 import sys
+import time
 from datetime import datetime, timedelta
 
-# Import screen color monitor
-from screen_color_monitor import ScreenColorMonitor, HybridColorProcessor
-
 gi.require_version('Gtk', '4.0')
 gi.require_version('Gtk4LayerShell', '1.0')
 
 from gi.repository import Gtk, GLib, Pango, PangoCairo
 import gi.repository.Gtk4LayerShell as LayerShell
 import cairo
+import numpy as np
+
+# Duration units in the order they must appear (e.g. '1h30m45s') and their length in seconds
+_DURATION_UNITS = 'hms'
+_DURATION_UNIT_SECONDS = (3600, 60, 1)
+
+# Padding (px) around pre-rendered glow masks so strokes and offsets aren't clipped
+_GLOW_MASK_PAD = 4
+# Padding (px, full resolution) around the half-resolution glow buffer - covers mask padding plus layer offsets
+_GLOW_BUFFER_PAD = 2 * _GLOW_MASK_PAD
+
+# Padding (px) around the pre-rendered alarm message so glyph overhang isn't clipped
+_ALARM_MSG_PAD = 2
+
+# Lightbulb style stroke counts
+# Reduced from 30 to 15 glow layers and from 8 to 4 core lines for better performance
+_LIGHTBULB_GLOW_LAYERS = 15  # Thin lines create the cloudy light trail
+_LIGHTBULB_CORE_LINES = 4
+
+# Red alert color used while a finished countdown is flashing
+_FLASH_COLOR_RGB = (1.0, 0.0, 0.0)
+
+# Pulse quantization for animation redraw skipping (steps per unit of sin output)
+_PULSE_BUCKETS = 32
+
+# Screen color samples closer than this (seconds, 0-255 RGB distance) to the last one are dropped
+_SCREEN_COLOR_DEBOUNCE = 0.2
+_SCREEN_COLOR_MIN_DELTA = 8
+
+# Sine lookup table for animation pulses (1024 steps per turn, index wraps with a bit mask)
+_SIN_LUT_SIZE = 1024
+_SIN_LUT = np.sin(np.linspace(0, 2 * np.pi, _SIN_LUT_SIZE, endpoint=False)).tolist()
+_SIN_LUT_SCALE = _SIN_LUT_SIZE / (2 * math.pi)
+
+
+def _lut_sin(phase):
+    """Approximate math.sin(phase) with a table lookup"""
+    return _SIN_LUT[int(phase * _SIN_LUT_SCALE) & (_SIN_LUT_SIZE - 1)]
+
+
+def _compute_deadline_params(remaining_seconds, frame, base_r, base_g, base_b,
+                             flicker_chance, flicker_roll, flicker_value):
+    """
+    Compute the per-frame deadline animation parameters
+    Random inputs are passed in as floats in [0, 1) so this stays a pure function
+    Returns: (urgency, pulse, flicker, r, g, b, num_glow_layers)
+    """
+    # Urgency increases as time runs out
+    if remaining_seconds > 300:  # More than 5 minutes
+        urgency = 0.5
+    elif remaining_seconds > 60:  # More than 1 minute
+        urgency = 0.7
+    elif remaining_seconds > 10:  # More than 10 seconds
+        urgency = 0.9
+    else:  # Final 10 seconds
+        urgency = 1.0
+
+    # Pulsing effect - slower pulse for less urgency
+    pulse_speed = 0.08 * (1.0 + urgency)
+    pulse = 0.7 + 0.3 * sin(frame * pulse_speed)
+
+    # Random flicker effect (horror movie aesthetic)
+    flicker = 1.0
+    if flicker_roll < flicker_chance * urgency:
+        flicker = 0.7 + flicker_value * 0.3
+
+    # Color scheme - use dynamic color with urgency-based intensity
+    # Dims color at low urgency, brightens as deadline approaches
+    if urgency < 0.7:
+        # Darker intensity for low urgency
+        scale = 0.55
+    elif urgency < 0.9:
+        # Medium intensity
+        scale = 0.8
+    else:
+        # Full brightness at high urgency
+        scale = 1.0
+
+    # Reduced layer count for better performance
+    num_glow_layers = max(2, int(4 * urgency))  # Max 4 layers for low CPU usage
+
+    return urgency, pulse, flicker, base_r * scale, base_g * scale, base_b * scale, num_glow_layers
 
 
 class IPCServer:
     """Unix socket server for inter-process communication"""
+    # Explicit socket buffer size - the 16KB Linux default throttles pipelined requests
+    SOCKET_BUFFER_SIZE = 256 * 1024
+
     def __init__(self, socket_path='/tmp/intime_widget.sock'):
         self.socket_path = socket_path
         self.server_socket = None
-        self.callbacks = {}
+        self.callbacks = {}  # Encoded command name -> callback (dispatch without decoding)
 
     def register_callback(self, command, callback):
         """Register a callback function for a command"""
-        self.callbacks[command] = callback
+        self.callbacks[command.encode('utf-8')] = callback
 
     def start(self):
         """Start the IPC server"""
-        # Remove existing socket file if it exists
-        if os.path.exists(self.socket_path):
-            os.unlink(self.socket_path)
-
         # Create Unix domain socket
         self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.server_socket.bind(self.socket_path)
+        self._set_buffer_sizes(self.server_socket)
+
+        # Bind directly; only remove a stale socket file if one is in the way
+        try:
+            self.server_socket.bind(self.socket_path)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                raise
+            os.unlink(self.socket_path)
+            self.server_socket.bind(self.socket_path)
         self.server_socket.listen(5)
         self.server_socket.setblocking(False)
 
         # Make socket readable by all users
         os.chmod(self.socket_path, 0o666)
 
-        # Integrate with GTK main loop
-        GLib.io_add_watch(
+        # Integrate with GTK main loop (unix fd sources skip the IOChannel wrapping)
+        GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT,
             self.server_socket.fileno(),
-            GLib.IO_IN,
+            GLib.IOCondition.IN,
             self._on_incoming_connection
         )
 
         print(f"IPC server listening on {self.socket_path}")
 
-    def _on_incoming_connection(self, fd, condition):
+    def _on_incoming_connection(self, fd, condition, *user_data):
         """Handle incoming connection"""
         try:
             client_socket, _ = self.server_socket.accept()
             client_socket.setblocking(False)
+            self._set_buffer_sizes(client_socket)
 
-            # Add watch for client data
-            GLib.io_add_watch(
+            # Add watch for client data (the buffer collects input across wakeups)
+            GLib.unix_fd_add_full(
+                GLib.PRIORITY_DEFAULT,
                 client_socket.fileno(),
-                GLib.IO_IN,
+                GLib.IOCondition.IN,
                 self._on_client_data,
-                client_socket
+                client_socket,
+                bytearray()
             )
         except Exception as e:
             print(f"Error accepting connection: {e}")
 
         return True  # Continue watching
 
-    def _on_client_data(self, fd, condition, client_socket):
-        """Handle data from client"""
-        try:
-            data = client_socket.recv(1024).decode('utf-8').strip()
-
-            if not data:
-                client_socket.close()
-                return False
-
-            # Parse command (format: "command:arg1:arg2:...")
-            parts = data.split(':', 1)
-            command = parts[0]
-            args = parts[1] if len(parts) > 1 else None
+    def _set_buffer_sizes(self, sock):
+        """Set send/receive buffer sizes on a socket"""
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SOCKET_BUFFER_SIZE)
 
-            # Execute callback if registered
-            if command in self.callbacks:
-                result = self.callbacks[command](args)
-                response = f"OK:{result}\n" if result else "OK\n"
-            else:
-                response = f"ERROR:Unknown command '{command}'\n"
-
-            client_socket.send(response.encode('utf-8'))
+    def _on_client_data(self, fd, condition, client_socket, buffer):
+        """Handle data from client (one command per line, all pending commands are answered)"""
+        try:
+            # Drain everything the client has sent so far
+            eof = False
+            while True:
+                try:
+                    chunk = client_socket.recv(1024)
+                except BlockingIOError:
+                    break
+                if not chunk:
+                    eof = True
+                    break
+                buffer += chunk
+
+            # Spurious wakeup - keep watching until the client sends something or hangs up.
+            # Whatever arrived is dispatched as is: a short send() on a local stream socket
+            # arrives in one piece, so clients needn't newline-terminate or half-close.
+            if not eof and not buffer:
+                return True
+
+            responses = [self._dispatch_command(line)
+                         for line in bytes(buffer).splitlines() if line.strip()]
+
+            if responses:
+                client_socket.sendall(''.join(responses).encode('utf-8'))
             client_socket.close()
 
         except Exception as e:
@@ -122,6 +223,26 @@ class IPCServer:
 
         return False  # Remove watch after handling
 
+    def _dispatch_command(self, data):
+        """Run the callback for a single raw command line and return the response"""
+        data = data.strip()
+
+        # Parse command (format: "command:arg1:arg2:...") on raw bytes - only the args get decoded
+        separator = data.find(b':')
+        if separator == -1:
+            command = data
+            args = None
+        else:
+            command = data[:separator]
+            args = data[separator + 1:].decode('utf-8')
+
+        # Execute callback if registered
+        callback = self.callbacks.get(command)
+        if callback is not None:
+            result = callback(args)
+            return f"OK:{result}\n" if result else "OK\n"
+        return f"ERROR:Unknown command '{command.decode('utf-8', 'replace')}'\n"
+
     def stop(self):
         """Stop the IPC server"""
         if self.server_socket:
@@ -138,21 +259,31 @@ def parse_duration(duration_str):
     if not duration_str:
         return 0
 
-    # Pattern to match hours, minutes, seconds
-    pattern = r'(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?'
-    match = re.match(pattern, duration_str.strip())
-
-    if not match:
+    # Hand-written scanner for the tiny [digits unit]{1,3} grammar (faster than a regex)
+    total = 0
+    value = None  # Digits accumulated since the last unit
+    last_unit = -1  # Index of the last unit seen, enforces h -> m -> s order
+    for char in duration_str.strip():
+        if '0' <= char <= '9':
+            value = (value or 0) * 10 + (ord(char) - 48)
+            continue
+
+        unit = _DURATION_UNITS.find(char)
+        if unit <= last_unit or value is None:
+            raise ValueError(f"Invalid duration format: {duration_str}. Use format like '30m', '1h', '1h30m45s'")
+
+        total += value * _DURATION_UNIT_SECONDS[unit]
+        last_unit = unit
+        value = None
+
+    if value is not None:
+        # Trailing number without a unit
         raise ValueError(f"Invalid duration format: {duration_str}. Use format like '30m', '1h', '1h30m45s'")
 
-    hours = int(match.group(1) or 0)
-    minutes = int(match.group(2) or 0)
-    seconds = int(match.group(3) or 0)
-
-    if hours == 0 and minutes == 0 and seconds == 0:
+    if total == 0:
         raise ValueError(f"Duration must be greater than 0: {duration_str}")
 
-    return hours * 3600 + minutes * 60 + seconds
+    return total
 
 def parse_args():
     """Parse command line arguments"""
@@ -244,6 +375,33 @@ class InTimeWidget(Gtk.Window):
     # Class variables to share IPC server across all instances
     _shared_ipc_server = None
     _all_instances = []
+    # Parsed config files shared by all instances: path -> ((st_mtime_ns, st_size, st_ino), config dict)
+    _config_cache = {}
+    # Static transparency stylesheet, parsed once and added once per display
+    _css_provider = None
+    _css_displays = set()
+    _CSS = """
+        * {
+            background-color: rgba(0, 0, 0, 0);
+            background-image: none;
+            background: none;
+        }
+
+        window,
+        window.background {
+            background-color: rgba(0, 0, 0, 0);
+            background-image: none;
+            background: none;
+            border: none;
+            box-shadow: none;
+        }
+
+        drawingarea {
+            background-color: rgba(0, 0, 0, 0);
+            background-image: none;
+            background: none;
+        }
+        """
 
     def __init__(self, mode='clock', duration=None, cli_overrides=None, monitor_index=None):
         super().__init__()
@@ -262,10 +420,15 @@ class InTimeWidget(Gtk.Window):
         if cli_overrides:
             self.config.update(cli_overrides)
 
+        # Parsed text color, refreshed whenever config['color'] changes
+        self._color_rgb = self._parse_color(self.config.get('color', '#00FF00'))
+        self._last_color_ts = 0.0  # Last accepted screen color sample (monotonic time, RGB)
+        self._last_color_rgb = None
+
         # Mode and duration settings
         self.mode = mode
         self.duration_seconds = duration
-        self.end_time = None
+        self.end_ts = None  # Countdown end as a Unix timestamp (avoids datetime arithmetic per frame)
         self.is_flashing = False
         self.flash_state = False  # For toggling flash effect
         self.monitor_index = monitor_index
@@ -273,7 +436,27 @@ class InTimeWidget(Gtk.Window):
         # Animation state for light bulb effect
         self.animation_frame = 0
         self.glow_intensity = 0.0
-        self.flicker_offsets = []  # Random flicker for each character
+        # Pulse values for the current animation_frame (advanced once per tick in update_animation)
+        self._lightbulb_pulse = 0.85
+        self._alarm_pulse = 0.7
+        self._msg_pulse = 0.8
+        self._rng = np.random.default_rng()  # Widget-local PCG64 generator for batched per-frame randoms
+        # Preallocated per-frame random buffer for the lightbulb strokes (refilled in place each frame)
+        self._flicker = np.zeros((_LIGHTBULB_GLOW_LAYERS + _LIGHTBULB_CORE_LINES, 6), dtype=np.float32)
+
+        # Cached Pango layout for the clock text (rebuilt when font settings change)
+        self._layout = None
+        self._font_desc = None
+        self._last_font_key = None
+        self._last_text_len = None
+        self._text_size = (0, 0)
+
+        # Cached text outline and stroked glow masks (rebuilt when the text or font changes)
+        self._text_cache_key = None
+        self._text_path = None
+        self._glow_masks = {}
+        self._glow_buffer = None  # Half-resolution offscreen surface the glow layers are drawn into
+        self._glow_buffer_size = None
 
         # Forbidden alarm state
         self.forbidden_alarm_active = False
@@ -283,12 +466,26 @@ class InTimeWidget(Gtk.Window):
         self.alarm_intensity = 0.0  # 0.0 to 1.0
         self.alarm_wave_offset = 0
         self.alarm_shake_offset = (0, 0)
+        self.alarm_frame = 0  # Alarm animation tick counter
+        # Shake jitter RNG state, seeded per instance so monitors don't shake in lockstep
+        self._lcg_state = (time.monotonic_ns() ^ id(self)) & 0xFFFFFFFF
+        self._alarm_msg_surface = None  # Pre-rendered alarm message (rebuilt when the text or scale changes)
+        self._alarm_msg_surface_key = None
+        self._alarm_msg_size = (0, 0)
+        self._alarm_msg_font = Pango.FontDescription("sans bold")
+        self._alarm_msg_font.set_absolute_size(24 * Pango.SCALE)
+        self._alarm_msg_layout = None  # Created on first alarm, reused for every message
 
         # Deadline mode animation state
         self.deadline_pulse_frame = 0
         self.deadline_tick_state = False
         self.deadline_flicker_chance = 0.1  # 10% chance per second
         self.deadline_last_second = -1  # Track when seconds change for tick effect
+        self._last_pulse_speed = 0.08  # Deadline pulse speed used by the last drawn frame
+        self._last_animation_signature = None  # Visible animation state of the last queued frame
+        self._text_surface_cache = {}  # Pre-rendered deadline text surfaces for the current text
+        self._text_surface_text = None
+        self._last_rendered_params = None  # (time_str, flash_state) of the last drawn frame
         self.animation_timer_running = False  # Track if 50ms animation timer is active
         self.alarm_animation_timer_running = False  # Track if alarm animation timer is active
         self.alarm_animation_timer_id = None  # Store timer ID for cancellation
@@ -304,12 +501,12 @@ class InTimeWidget(Gtk.Window):
 
         # Calculate end time for countdown modes
         if self.mode in ['countdown', 'deadline'] and self.duration_seconds:
-            self.end_time = datetime.now() + timedelta(seconds=self.duration_seconds)
+            self.end_ts = time.time() + self.duration_seconds
         elif self.mode == 'midnight':
             # Calculate time until midnight (23:59:59)
             now = datetime.now()
             tomorrow = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-            self.end_time = tomorrow - timedelta(seconds=1)  # 23:59:59 today
+            self.end_ts = (tomorrow - timedelta(seconds=1)).timestamp()  # 23:59:59 today
 
         # Disable GTK theme at the settings level
         settings = Gtk.Settings.get_default()
@@ -350,8 +547,14 @@ class InTimeWidget(Gtk.Window):
             update_interval = self.config.get('screen_sampling', {}).get('update_interval', 0.5)
             throttle_threshold = self.config.get('screen_sampling', {}).get('throttle_threshold', 15)
 
+            # Imported on use - sampling is disabled by default
+            from screen_color_monitor import ScreenColorMonitor, HybridColorProcessor
+            self._color_processor = HybridColorProcessor
+
+            # Color processing runs on the monitor's capture worker; results come back via GLib.idle_add
             self.screen_color_monitor = ScreenColorMonitor(
                 callback=self._on_screen_color_change,
+                processor=self._process_screen_color,
                 update_interval=update_interval,
                 throttle_threshold=throttle_threshold
             )
@@ -525,87 +728,55 @@ class InTimeWidget(Gtk.Window):
         cr.restore()
 
         # Get display string based on mode
-        now = datetime.now()
-        time_str = ""
-
-        if self.mode == 'clock':
-            # Standard clock mode
-            time_str = now.strftime("%H:%M:%S")
-        elif self.mode in ['countdown', 'midnight', 'deadline']:
-            # Calculate remaining time
-            if self.end_time:
-                remaining = self.end_time - now
-
-                if remaining.total_seconds() <= 0:
-                    # Countdown finished
-                    if self.mode == 'deadline':
-                        # Trigger forbidden alarm for deadline mode
-                        if not self.forbidden_alarm_active:
-                            self.forbidden_alarm_active = True
-                            self.forbidden_alarm_message = "DEADLINE REACHED"
-                            # Start alarm animation timer if not already running
-                            if not self.alarm_animation_timer_running:
-                                # Reduced from 50ms to 100ms (10fps instead of 20fps) for better performance
-                                self.alarm_animation_timer_id = GLib.timeout_add(100, self.update_alarm_animation)
-                                self.alarm_animation_timer_running = True
-                    else:
-                        # Regular flashing for countdown/midnight
-                        self.is_flashing = True
-                    time_str = "00:00:00"
-                else:
-                    # Format remaining time
-                    total_seconds = int(remaining.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    seconds = total_seconds % 60
-
-                    # Use HH:MM:SS format for countdown (decremental clock)
-                    time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            else:
-                time_str = "ERROR"
-
-        # Parse color from config
-        color = self.config.get('color', '#00FF00')
+        time_str = self._get_time_str()
+        self._last_rendered_params = (time_str, self.flash_state)
 
         # If flashing, toggle between configured color and red
-        if self.is_flashing:
-            if self.flash_state:
-                color = '#FF0000'  # Red for alert
-            # else: use configured color
-            # Flash state will be toggled in update_time()
-
-        # Convert hex color to RGB (for idle text and normal rendering)
-        r = int(color[1:3], 16) / 255.0
-        g = int(color[3:5], 16) / 255.0
-        b = int(color[5:7], 16) / 255.0
+        # Flash state will be toggled in update_time()
+        if self.is_flashing and self.flash_state:
+            r, g, b = _FLASH_COLOR_RGB
+        else:
+            # Pre-parsed config color (for idle text and normal rendering)
+            r, g, b = self._color_rgb
         opacity = self.config.get('opacity', 0.5)
 
         # Set up Pango layout for text
-        layout = PangoCairo.create_layout(cr)
         font_size_px = self.config.get('font_size', 100)
-
-        # Use thin font for lightbulb style (like thin wire filaments)
         style = self.config.get('style', 'normal')
-        if style == 'lightbulb':
-            # Use ultra-light weight for thin wire effect
-            font_desc = Pango.FontDescription("monospace ultra-light")
+
+        # Layout and font only change on config reload - rebuild them only when the font key changes
+        font_key = (style, font_size_px)
+        if self._layout is None or font_key != self._last_font_key:
+            self._layout = PangoCairo.create_layout(cr)
+
+            # Use thin font for lightbulb style (like thin wire filaments)
+            if style == 'lightbulb':
+                # Use ultra-light weight for thin wire effect
+                self._font_desc = Pango.FontDescription("monospace ultra-light")
+            else:
+                self._font_desc = Pango.FontDescription("monospace bold")
+
+            self._font_desc.set_absolute_size(font_size_px * Pango.SCALE)
+            self._layout.set_font_description(self._font_desc)
+            self._last_font_key = font_key
+            self._last_text_len = None
         else:
-            font_desc = Pango.FontDescription("monospace bold")
+            # Re-sync the cached layout with this frame's Cairo context
+            PangoCairo.update_layout(cr, self._layout)
 
-        font_desc.set_absolute_size(font_size_px * Pango.SCALE)
-        layout.set_font_description(font_desc)
+        layout = self._layout
         layout.set_text(time_str, -1)
 
-        # Get text dimensions for centering
-        text_width, text_height = layout.get_pixel_size()
+        # Get text dimensions for centering (monospace: size only changes with text length)
+        if len(time_str) != self._last_text_len:
+            self._text_size = layout.get_pixel_size()
+            self._last_text_len = len(time_str)
+        text_width, text_height = self._text_size
 
         # Center the text in the available space
         x = max(0, (width - text_width) / 2)
         y = max(0, (height - text_height) / 2)
 
-        # Get style for rendering decisions
-        style = self.config.get('style', 'normal')
-
         # Check if forbidden alarm is active (overrides all other styles)
         if self.forbidden_alarm_active and self.alarm_intensity > 0.05:
             # Draw intense forbidden alarm
@@ -622,7 +793,7 @@ class InTimeWidget(Gtk.Window):
                 self._draw_lightbulb_text(cr, layout, x, y, time_str)
             elif style == 'bordered':
                 # Bordered text with thin dark outline
-                self._draw_bordered_text(cr, layout, x, y, r, g, b, opacity)
+                self._draw_bordered_text(cr, layout, x, y, time_str, r, g, b, opacity)
             else:
                 # Normal rendering
                 # Draw the text
@@ -630,76 +801,212 @@ class InTimeWidget(Gtk.Window):
                 cr.set_source_rgba(r, g, b, opacity)
                 PangoCairo.show_layout(cr, layout)
 
+    @staticmethod
+    def _parse_color(color):
+        """Convert a '#RRGGBB' hex color to an (r, g, b) float tuple"""
+        value = int(color[1:7], 16)
+        return ((value >> 16) / 255.0, ((value >> 8) & 0xFF) / 255.0, (value & 0xFF) / 255.0)
+
+    def _get_time_str(self):
+        """Get the display string for the current mode (triggers alarm/flashing when finished - draw only)"""
+        if self.mode in ['countdown', 'midnight', 'deadline'] and self.end_ts and self.end_ts - time.time() <= 0:
+            # Countdown finished
+            if self.mode == 'deadline':
+                # Trigger forbidden alarm for deadline mode
+                if not self.forbidden_alarm_active:
+                    self.forbidden_alarm_active = True
+                    self.forbidden_alarm_message = "DEADLINE REACHED"
+                    # Start alarm animation timer if not already running
+                    if not self.alarm_animation_timer_running:
+                        # Reduced from 50ms to 100ms (10fps instead of 20fps) for better performance
+                        self.alarm_animation_timer_id = GLib.timeout_add(100, self.update_alarm_animation)
+                        self.alarm_animation_timer_running = True
+            else:
+                # Regular flashing for countdown/midnight
+                self.is_flashing = True
+
+        return self._format_time_str()
+
+    def _format_time_str(self):
+        """Format the display string for the current mode (no side effects - safe for redraw checks)"""
+        time_str = ""
+
+        if self.mode == 'clock':
+            # Standard clock mode (f-string is much cheaper than strftime)
+            now = datetime.now()
+            time_str = f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
+        elif self.mode in ['countdown', 'midnight', 'deadline']:
+            # Calculate remaining time
+            if self.end_ts:
+                remaining = self.end_ts - time.time()
+
+                if remaining <= 0:
+                    # Countdown finished
+                    time_str = "00:00:00"
+                else:
+                    # Format remaining time
+                    total_seconds = int(remaining)
+                    hours = total_seconds // 3600
+                    minutes = (total_seconds % 3600) // 60
+                    seconds = total_seconds % 60
+
+                    # Use HH:MM:SS format for countdown (decremental clock)
+                    time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            else:
+                time_str = "ERROR"
+
+        return time_str
+
     def _draw_lightbulb_text(self, cr, layout, x, y, time_str):
         """Draw text with 3 Body Problem countdown effect - thin glowing line trails"""
-        # Calculate animated glow intensity
-        base_pulse = 0.85 + 0.15 * math.sin(self.animation_frame * 0.08)
-        shimmer = 1.0 + (random.random() - 0.5) * 0.1
+        num_layers = _LIGHTBULB_GLOW_LAYERS
+        num_core = _LIGHTBULB_CORE_LINES
+
+        # Refill the whole frame's random values in place instead of ~76 random.uniform() calls
+        # Rows: glow layers then core lines
+        # Columns: offset_x, offset_y, line_width, opacity, red, green
+        rnd = self._rng.random(dtype=np.float32, out=self._flicker)
+        glow = rnd[:num_layers]
+        core = rnd[num_layers:]
+
+        # Calculate animated glow intensity (shimmer reuses a column the core lines don't need)
+        base_pulse = self._lightbulb_pulse
+        shimmer = 1.0 + (core[0, 4] - 0.5) * 0.1
         glow_intensity = base_pulse * shimmer
 
-        # Draw many overlapping thin strokes with slight offsets for cloudy effect
-        # Reduced from 30 to 15 for better performance
-        num_layers = 15  # Thin lines create the cloudy light trail
-
-        for i in range(num_layers):
-            # Random offset for each layer (creates the shallow cloudy spread)
-            offset_x = random.uniform(-1.2, 1.2)
-            offset_y = random.uniform(-1.2, 1.2)
+        # Random offset for each layer (creates the shallow cloudy spread)
+        glow_ox = (glow[:, 0] * 2.4 - 1.2).tolist()
+        glow_oy = (glow[:, 1] * 2.4 - 1.2).tolist()
+        # Very thin line width
+        glow_lw = 0.3 + glow[:, 2] * 0.5
+        # Random opacity for depth/cloudy effect
+        glow_op = ((0.08 + glow[:, 3] * 0.07) * glow_intensity).tolist()
+        # Blue-white glow color with variation
+        glow_r = (0.85 + glow[:, 4] * 0.13).tolist()
+        glow_g = (0.92 + glow[:, 5] * 0.08).tolist()
 
-            # Get the text outline path
-            cr.new_path()
-            cr.move_to(x + offset_x, y + offset_y)
-            PangoCairo.layout_path(cr, layout)
+        # Draw many overlapping thin strokes with slight offsets for cloudy effect
+        glow_colors = [(glow_r[i], glow_g[i], 1.0, glow_op[i]) for i in range(num_layers)]
+        self._stamp_glow_layers(cr, layout, time_str, x, y, glow_ox, glow_oy, glow_lw, glow_colors)
 
-            # Very thin line width
-            line_width = random.uniform(0.3, 0.8)
-            cr.set_line_width(line_width)
+        # Add a few brighter core lines for definition
+        core_ox = (core[:, 0] - 0.5).tolist()
+        core_oy = (core[:, 1] - 0.5).tolist()
+        core_lw = 0.4 + core[:, 2] * 0.3
+        core_op = ((0.2 + core[:, 3] * 0.1) * glow_intensity).tolist()
 
-            # Random opacity for depth/cloudy effect
-            opacity = random.uniform(0.08, 0.15) * glow_intensity
+        core_colors = [(0.95, 0.98, 1.0, core_op[i]) for i in range(num_core)]
+        self._stamp_glow_layers(cr, layout, time_str, x, y, core_ox, core_oy, core_lw, core_colors)
 
-            # Blue-white glow color with variation
-            r = random.uniform(0.85, 0.98)
-            g = random.uniform(0.92, 1.0)
-            b = 1.0
+    def _stamp_glow_layers(self, cr, layout, time_str, x, y, offsets_x, offsets_y, line_widths, colors):
+        """Stamp stroked-outline masks at (x, y) + offset, grouped by line-width bucket
 
-            cr.set_source_rgba(r, g, b, opacity)
-            cr.stroke()
+        Glow is low-frequency, so the stamps go into a half-resolution buffer that
+        is scaled back up onto cr (a quarter of the pixels to fill).
 
-        # Add a few brighter core lines for definition
-        # Reduced from 8 to 4 for better performance
-        for i in range(4):
-            offset_x = random.uniform(-0.5, 0.5)
-            offset_y = random.uniform(-0.5, 0.5)
+        Args:
+            line_widths: NumPy array of per-layer stroke widths
+            colors: Per-layer (r, g, b, a) tuples
+        """
+        text_width, text_height = self._text_size
+        glow_buffer = self._get_glow_buffer(text_width + 2 * _GLOW_BUFFER_PAD,
+                                            text_height + 2 * _GLOW_BUFFER_PAD)
+        glow_cr = cairo.Context(glow_buffer)
+        glow_cr.scale(0.5, 0.5)
+
+        # Sort layers by bucket so each mask is looked up once and consecutive stamps share it
+        buckets = np.round(line_widths, 1)
+        order = np.argsort(buckets, kind='stable').tolist()
+        buckets = buckets.tolist()
+
+        # Stamps are positioned relative to the buffer origin at (x, y) - _GLOW_BUFFER_PAD
+        origin = _GLOW_BUFFER_PAD - _GLOW_MASK_PAD
+        mask = None
+        mask_width = None
+        for i in order:
+            if buckets[i] != mask_width:
+                mask_width = buckets[i]
+                mask = self._get_glow_mask(cr, layout, time_str, mask_width)
+            glow_cr.set_source_rgba(*colors[i])
+            glow_cr.mask_surface(mask, origin + offsets_x[i], origin + offsets_y[i])
+
+        # Composite the half-resolution glow back at full size
+        cr.save()
+        cr.translate(x - _GLOW_BUFFER_PAD, y - _GLOW_BUFFER_PAD)
+        cr.scale(2.0, 2.0)
+        cr.set_source_surface(glow_buffer, 0, 0)
+        cr.paint()
+        cr.restore()
 
+    def _get_glow_buffer(self, width, height):
+        """Get a cleared half-resolution ARGB buffer covering width x height (reused across frames)"""
+        size = ((width + 1) // 2, (height + 1) // 2)
+        if self._glow_buffer is None or self._glow_buffer_size != size:
+            self._glow_buffer = cairo.ImageSurface(cairo.FORMAT_ARGB32, *size)
+            self._glow_buffer_size = size
+        else:
+            clear_cr = cairo.Context(self._glow_buffer)
+            clear_cr.set_operator(cairo.Operator.CLEAR)
+            clear_cr.paint()
+        return self._glow_buffer
+
+    def _get_text_path(self, cr, layout, time_str):
+        """Get the flattened text outline anchored at the origin (cached until the text or font changes)"""
+        cache_key = (time_str, self._last_font_key)
+        if cache_key != self._text_cache_key:
             cr.new_path()
-            cr.move_to(x + offset_x, y + offset_y)
+            cr.move_to(0, 0)
             PangoCairo.layout_path(cr, layout)
+            self._text_path = cr.copy_path_flat()
+            cr.new_path()
 
-            cr.set_line_width(random.uniform(0.4, 0.7))
-            cr.set_source_rgba(0.95, 0.98, 1.0, random.uniform(0.2, 0.3) * glow_intensity)
-            cr.stroke()
-
-    def _draw_bordered_text(self, cr, layout, x, y, r, g, b, opacity):
+            self._text_cache_key = cache_key
+            self._glow_masks = {}
+        return self._text_path
+
+    def _get_glow_mask(self, cr, layout, time_str, line_width):
+        """Get an A8 mask of the text outline stroked at line_width (rounded to 0.1px buckets)"""
+        text_path = self._get_text_path(cr, layout, time_str)
+
+        line_width = round(line_width, 1)
+        mask = self._glow_masks.get(line_width)
+        if mask is None:
+            text_width, text_height = self._text_size
+            mask = cairo.ImageSurface(cairo.FORMAT_A8,
+                                      text_width + 2 * _GLOW_MASK_PAD,
+                                      text_height + 2 * _GLOW_MASK_PAD)
+            mask_cr = cairo.Context(mask)
+            mask_cr.translate(_GLOW_MASK_PAD, _GLOW_MASK_PAD)
+            mask_cr.append_path(text_path)
+            mask_cr.set_line_width(line_width)
+            mask_cr.stroke()
+            self._glow_masks[line_width] = mask
+        return mask
+
+    def _draw_bordered_text(self, cr, layout, x, y, time_str, r, g, b, opacity):
         """Draw text with a thin dark border/outline"""
+        # Replay the cached outline instead of re-shaping the layout every frame
+        text_path = self._get_text_path(cr, layout, time_str)
+
+        cr.save()
+        cr.translate(x, y)
+
         # Draw a thin border stroke
-        cr.move_to(x, y)
-        PangoCairo.layout_path(cr, layout)
+        cr.new_path()
+        cr.append_path(text_path)
         cr.set_line_width(1.8)
         # Use fully opaque black for the border
         cr.set_source_rgba(0.0, 0.0, 0.0, 1.0)
-        cr.stroke()
+        cr.stroke_preserve()
 
-        # Then fill the text with the configured color
-        cr.move_to(x, y)
-        PangoCairo.layout_path(cr, layout)
+        # Then fill the same path with the configured color
         cr.set_source_rgba(r, g, b, opacity)
         cr.fill()
 
+        cr.restore()
+
     def _draw_forbidden_alarm(self, cr, layout, x, y, time_str, width, height):
         """Draw intense forbidden alarm with all effects combined"""
-        import math
-
         # Apply shake offset to main position
         shake_x = x + self.alarm_shake_offset[0]
         shake_y = y + self.alarm_shake_offset[1]
@@ -708,90 +1015,121 @@ class InTimeWidget(Gtk.Window):
         center_x = width / 2
         center_y = height / 2
 
-        for i in range(3):
-            wave_radius = (self.alarm_wave_offset + i * 60) % 200 + 50
+        # All three 3px rings come from one radial gradient fill instead of three arc strokes
+        max_radius = 252  # Outer edge of the largest possible ring (radius 249 + half line width)
+        waves = cairo.RadialGradient(center_x, center_y, 0, center_x, center_y, max_radius)
+        for wave_radius in sorted((self.alarm_wave_offset + i * 60) % 200 + 50 for i in range(3)):
             wave_alpha = (1.0 - wave_radius / 250) * self.alarm_intensity * 0.3
+            waves.add_color_stop_rgba((wave_radius - 1.5) / max_radius, 1.0, 0.0, 0.0, 0.0)
+            waves.add_color_stop_rgba((wave_radius - 1.0) / max_radius, 1.0, 0.0, 0.0, wave_alpha)
+            waves.add_color_stop_rgba((wave_radius + 1.0) / max_radius, 1.0, 0.0, 0.0, wave_alpha)
+            waves.add_color_stop_rgba((wave_radius + 1.5) / max_radius, 1.0, 0.0, 0.0, 0.0)
 
-            cr.arc(center_x, center_y, wave_radius, 0, 2 * math.pi)
-            cr.set_source_rgba(1.0, 0.0, 0.0, wave_alpha)
-            cr.set_line_width(3)
-            cr.stroke()
+        cr.rectangle(center_x - max_radius, center_y - max_radius, 2 * max_radius, 2 * max_radius)
+        cr.set_source(waves)
+        cr.fill()
 
         # 2. Draw pulsing red glow around text (many layers)
-        pulse = 0.7 + 0.3 * math.sin(self.animation_frame * 0.2)
+        pulse = self._alarm_pulse
         glow_intensity = pulse * self.alarm_intensity
 
         num_layers = 12  # Intense glow (reduced from 40 for performance)
-        for i in range(num_layers):
-            offset_x = random.uniform(-3, 3)
-            offset_y = random.uniform(-3, 3)
-
-            cr.new_path()
-            cr.move_to(shake_x + offset_x, shake_y + offset_y)
-            PangoCairo.layout_path(cr, layout)
 
-            line_width = random.uniform(0.5, 1.5)
-            cr.set_line_width(line_width)
+        # One batch of random values per frame
+        # Columns: offset_x, offset_y, line_width, opacity, green
+        rnd = self._rng.random((num_layers, 5))
+        glow_ox = (rnd[:, 0] * 6.0 - 3.0).tolist()
+        glow_oy = (rnd[:, 1] * 6.0 - 3.0).tolist()
+        glow_lw = 0.5 + rnd[:, 2]
+        # Increased opacity since we have fewer layers
+        glow_op = ((0.2 + rnd[:, 3] * 0.3) * glow_intensity).tolist()
+        glow_g = (rnd[:, 4] * 0.1).tolist()  # Mostly red
 
-            # Increased opacity since we have fewer layers
-            opacity = random.uniform(0.2, 0.5) * glow_intensity
-            r = 1.0
-            g = random.uniform(0.0, 0.1)  # Mostly red
-            b = 0.0
-
-            cr.set_source_rgba(r, g, b, opacity)
-            cr.stroke()
+        glow_colors = [(1.0, glow_g[i], 0.0, glow_op[i]) for i in range(num_layers)]
+        self._stamp_glow_layers(cr, layout, time_str, shake_x, shake_y, glow_ox, glow_oy, glow_lw, glow_colors)
 
         # 3. Draw main text (bright red, high opacity)
-        cr.new_path()
-        cr.move_to(shake_x, shake_y)
-        PangoCairo.layout_path(cr, layout)
+        text_path = self._get_text_path(cr, layout, time_str)
+        cr.save()
+        cr.translate(shake_x, shake_y)
+        cr.append_path(text_path)
 
         # Very bright core
         cr.set_source_rgba(1.0, 0.0, 0.0, 0.95 * self.alarm_intensity)
         cr.fill()
+        cr.restore()
 
         # 4. Add white hot center for intensity
         # Reduced from 5 to 3 for performance
-        for i in range(3):
-            offset_x = random.uniform(-0.5, 0.5)
-            offset_y = random.uniform(-0.5, 0.5)
-
-            cr.new_path()
-            cr.move_to(shake_x + offset_x, shake_y + offset_y)
-            PangoCairo.layout_path(cr, layout)
+        # Columns: offset_x, offset_y, opacity
+        rnd = self._rng.random((3, 3))
+        center_ox = (rnd[:, 0] - 0.5).tolist()
+        center_oy = (rnd[:, 1] - 0.5).tolist()
+        center_op = ((0.3 + rnd[:, 2] * 0.2) * glow_intensity).tolist()
 
-            cr.set_source_rgba(1.0, 1.0, 1.0, random.uniform(0.3, 0.5) * glow_intensity)
-            cr.set_line_width(0.3)
-            cr.stroke()
+        mask = self._get_glow_mask(cr, layout, time_str, 0.3)
+        for i in range(3):
+            cr.set_source_rgba(1.0, 1.0, 1.0, center_op[i])
+            cr.mask_surface(mask, shake_x + center_ox[i] - _GLOW_MASK_PAD, shake_y + center_oy[i] - _GLOW_MASK_PAD)
 
         # 5. Draw custom message below clock
         if self.forbidden_alarm_message and self.alarm_intensity > 0.5:
-            message_layout = PangoCairo.create_layout(cr)
-            message_font = Pango.FontDescription("sans bold")
-            message_font.set_absolute_size(24 * Pango.SCALE)
-            message_layout.set_font_description(message_font)
-            message_layout.set_text(self.forbidden_alarm_message, -1)
-
-            msg_width, msg_height = message_layout.get_pixel_size()
+            # Message is rendered once per text change - every layer is a blit of the same surface
+            message_surface = self._get_alarm_message_surface()
+            msg_width, msg_height = self._alarm_msg_size
             msg_x = (width - msg_width) / 2
-            msg_y = shake_y + layout.get_pixel_size()[1] + 30
+            msg_y = shake_y + self._text_size[1] + 30  # Clock height measured in on_draw
 
             # Pulsing message
-            msg_pulse = 0.8 + 0.2 * math.sin(self.animation_frame * 0.15)
+            msg_pulse = self._msg_pulse
 
             # Draw glow (reduced from 10 to 5 for performance)
+            # Columns: offset_x, offset_y, opacity
+            rnd = self._rng.random((5, 3))
+            msg_ox = (rnd[:, 0] * 4.0 - 2.0).tolist()
+            msg_oy = (rnd[:, 1] * 4.0 - 2.0).tolist()
+            msg_op = ((0.1 + rnd[:, 2] * 0.1) * msg_pulse).tolist()
             for i in range(5):
-                offset_x = random.uniform(-2, 2)
-                offset_y = random.uniform(-2, 2)
-                cr.move_to(msg_x + offset_x, msg_y + offset_y)
-                cr.set_source_rgba(1.0, 0.0, 0.0, random.uniform(0.1, 0.2) * msg_pulse)
-                PangoCairo.show_layout(cr, message_layout)
+                cr.set_source_surface(message_surface,
+                                      msg_x + msg_ox[i] - _ALARM_MSG_PAD,
+                                      msg_y + msg_oy[i] - _ALARM_MSG_PAD)
+                cr.paint_with_alpha(msg_op[i])
 
             # Draw main message
-            cr.move_to(msg_x, msg_y)
-            cr.set_source_rgba(1.0, 0.0, 0.0, 0.95 * msg_pulse)
-            PangoCairo.show_layout(cr, message_layout)
+            cr.set_source_surface(message_surface, msg_x - _ALARM_MSG_PAD, msg_y - _ALARM_MSG_PAD)
+            cr.paint_with_alpha(0.95 * msg_pulse)
+
+    def _get_alarm_message_surface(self):
+        """Get the alarm message rendered in solid red (rebuilt only when the message text or scale changes)
+
+        The surface is sized in device pixels for the widget scale factor so the text stays sharp on HiDPI outputs.
+        """
+        scale = self.get_scale_factor()
+        surface_key = (self.forbidden_alarm_message, scale)
+        if self._alarm_msg_surface_key != surface_key:
+            if self._alarm_msg_layout is None:
+                # Measure the message with a scratch context
+                scratch_cr = cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 1, 1))
+                self._alarm_msg_layout = PangoCairo.create_layout(scratch_cr)
+                self._alarm_msg_layout.set_font_description(self._alarm_msg_font)
+            message_layout = self._alarm_msg_layout
+            message_layout.set_text(self.forbidden_alarm_message, -1)
+            msg_width, msg_height = message_layout.get_pixel_size()
+
+            surface = cairo.ImageSurface(cairo.FORMAT_ARGB32,
+                                         (msg_width + 2 * _ALARM_MSG_PAD) * scale,
+                                         (msg_height + 2 * _ALARM_MSG_PAD) * scale)
+            surface.set_device_scale(scale, scale)
+            msg_cr = cairo.Context(surface)
+            PangoCairo.update_layout(msg_cr, message_layout)
+            msg_cr.move_to(_ALARM_MSG_PAD, _ALARM_MSG_PAD)
+            msg_cr.set_source_rgba(1.0, 0.0, 0.0, 1.0)
+            PangoCairo.show_layout(msg_cr, message_layout)
+
+            self._alarm_msg_surface = surface
+            self._alarm_msg_size = (msg_width, msg_height)
+            self._alarm_msg_surface_key = surface_key
+        return self._alarm_msg_surface
 
     def _draw_deadline_countdown(self, cr, layout, x, y, time_str, width, height, base_r=1.0, base_g=0.0, base_b=0.0):
         """Draw horror movie-style deadline countdown with ticking animation
@@ -799,33 +1137,23 @@ class InTimeWidget(Gtk.Window):
         Args:
             base_r, base_g, base_b: Base color (from config or screen sampling)
         """
-        import math
-
         # Get current remaining seconds to determine urgency level
         remaining_seconds = 0
-        if self.end_time:
-            remaining = self.end_time - datetime.now()
-            remaining_seconds = max(0, remaining.total_seconds())
-
-        # Urgency increases as time runs out
-        urgency = 1.0
-        if remaining_seconds > 300:  # More than 5 minutes
-            urgency = 0.5
-        elif remaining_seconds > 60:  # More than 1 minute
-            urgency = 0.7
-        elif remaining_seconds > 10:  # More than 10 seconds
-            urgency = 0.9
-        else:  # Final 10 seconds
-            urgency = 1.0
+        if self.end_ts:
+            remaining_seconds = max(0, self.end_ts - time.time())
+
+        # Urgency, pulse, flicker and color ramp (pure numeric, no Cairo state)
+        flicker_roll, flicker_value = self._rng.random(2).tolist()
+        urgency, pulse, flicker, r, g, b, num_glow_layers = _compute_deadline_params(
+            remaining_seconds, self.deadline_pulse_frame, base_r, base_g, base_b,
+            self.deadline_flicker_chance, flicker_roll, flicker_value
+        )
+        self._last_pulse_speed = 0.08 * (1.0 + urgency)
 
         # Base opacity (low to not obstruct screen, but visible enough for deadline mode)
         # Use higher default opacity for deadline mode to ensure visibility
         base_opacity = self.config.get('opacity', 0.35)
 
-        # Pulsing effect - slower pulse for less urgency
-        pulse_speed = 0.08 * (1.0 + urgency)
-        pulse = 0.7 + 0.3 * math.sin(self.deadline_pulse_frame * pulse_speed)
-
         # Tick effect - creates a brief flash when seconds change
         tick_intensity = 0.0
         current_second = int(remaining_seconds) % 60
@@ -838,76 +1166,127 @@ class InTimeWidget(Gtk.Window):
             tick_intensity = 0.3 * urgency
             # Reset tick state after brief moment (handled in animation update)
 
-        # Random flicker effect (horror movie aesthetic)
-        flicker = 1.0
-        if random.random() < self.deadline_flicker_chance * urgency:
-            flicker = random.uniform(0.7, 1.0)
-
-        # Color scheme - use dynamic color with urgency-based intensity
-        # Dims color at low urgency, brightens as deadline approaches
-        if urgency < 0.7:
-            # Darker intensity for low urgency
-            r, g, b = base_r * 0.55, base_g * 0.55, base_b * 0.55
-        elif urgency < 0.9:
-            # Medium intensity
-            r, g, b = base_r * 0.8, base_g * 0.8, base_b * 0.8
-        else:
-            # Full brightness at high urgency
-            r, g, b = base_r, base_g, base_b
+        # The composited glow + text + center strokes only change with the text, color, urgency
+        # and tick, so they are rendered once into a surface and blitted with the pulse/flicker alpha
+        if time_str != self._text_surface_text:
+            self._text_surface_cache = {}
+            self._text_surface_text = time_str
 
-        # 2. Draw dark red glow around text (layered for depth)
-        # Reduced layer count for better performance
-        num_glow_layers = max(2, int(4 * urgency))  # Max 4 layers for low CPU usage
-        for i in range(num_glow_layers):
-            offset_x = random.uniform(-2.5, 2.5)
-            offset_y = random.uniform(-2.5, 2.5)
+        scale = self.get_scale_factor()
+        cache_key = (self._last_font_key, r, g, b, urgency, tick_intensity, base_opacity, scale)
+        surface = self._text_surface_cache.get(cache_key)
+        if surface is None:
+            surface = self._render_deadline_surface(cr, layout, time_str, r, g, b, urgency,
+                                                    tick_intensity, num_glow_layers, base_opacity, scale)
+            self._text_surface_cache[cache_key] = surface
 
-            cr.new_path()
-            cr.move_to(x + offset_x, y + offset_y)
-            PangoCairo.layout_path(cr, layout)
+        cr.set_source_surface(surface, x - _GLOW_BUFFER_PAD, y - _GLOW_BUFFER_PAD)
+        cr.paint_with_alpha(pulse * flicker)
+
+    def _render_deadline_surface(self, cr, layout, time_str, r, g, b, urgency, tick_intensity,
+                                 num_glow_layers, base_opacity, scale):
+        """Rasterize the deadline glow, main text and center strokes (at full pulse) into a padded surface
+
+        The surface is sized in device pixels for the widget scale factor so HiDPI output stays sharp.
+        """
+        text_width, text_height = self._text_size
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32,
+                                     (text_width + 2 * _GLOW_BUFFER_PAD) * scale,
+                                     (text_height + 2 * _GLOW_BUFFER_PAD) * scale)
+        surface.set_device_scale(scale, scale)
+        text_cr = cairo.Context(surface)
+        x = y = _GLOW_BUFFER_PAD
 
-            line_width = random.uniform(0.4, 1.0)
-            cr.set_line_width(line_width)
+        # Text outline is shaped once per text change and replayed at each layer's offset
+        text_path = self._get_text_path(cr, layout, time_str)
 
-            # Glow should be independent of base_opacity for better visibility
-            # Increased opacity per layer since we have fewer layers
-            glow_opacity = random.uniform(0.3, 0.6) * pulse * flicker * urgency
-            cr.set_source_rgba(r, g * 0.2, b, glow_opacity)
-            cr.stroke()
+        # 2. Draw dark red glow around text (layered for depth)
+
+        # Per-layer table, computed in place with vector ops from one batch of random values
+        # Columns: offset_x, offset_y, line_width, opacity
+        layers = self._rng.random((num_glow_layers, 4))
+        layers[:, :2] *= 5.0
+        layers[:, :2] -= 2.5
+        layers[:, 2] *= 0.6
+        layers[:, 2] += 0.4
+        # Glow should be independent of base_opacity for better visibility
+        # Increased opacity per layer since we have fewer layers
+        layers[:, 3] *= 0.3
+        layers[:, 3] += 0.3
+        layers[:, 3] *= urgency
+        self._bucket_line_widths(layers)
+
+        # Glow is soft anyway - cheaper rasterization is fine here
+        text_cr.set_antialias(cairo.ANTIALIAS_FAST)
+        glow_g = g * 0.2
+        current_width = None
+        for offset_x, offset_y, line_width, opacity in layers.tolist():
+            if line_width != current_width:
+                # Set outside save/restore so it carries over to the next layer in the bucket
+                text_cr.set_line_width(line_width)
+                current_width = line_width
+            text_cr.save()
+            text_cr.translate(x + offset_x, y + offset_y)
+            text_cr.append_path(text_path)
+            text_cr.set_source_rgba(r, glow_g, b, opacity)
+            text_cr.stroke()
+            text_cr.restore()
+        text_cr.set_antialias(cairo.ANTIALIAS_DEFAULT)
 
         # 3. Draw main countdown text
-        cr.new_path()
-        cr.move_to(x, y)
-        PangoCairo.layout_path(cr, layout)
+        text_cr.save()
+        text_cr.translate(x, y)
+        text_cr.append_path(text_path)
 
-        # Main text opacity influenced by pulse, tick, and flicker
-        main_opacity = base_opacity * pulse * flicker * (1.0 + tick_intensity)
-        cr.set_source_rgba(r, g, b, main_opacity)
-        cr.fill()
+        # Main text opacity influenced by tick (pulse and flicker are applied when blitting)
+        main_opacity = base_opacity * (1.0 + tick_intensity)
+        text_cr.set_source_rgba(r, g, b, main_opacity)
+        text_cr.fill()
+        text_cr.restore()
 
         # 4. Add extra bright center strokes for intensity (especially on tick)
         if urgency > 0.5 or tick_intensity > 0:
             num_center_layers = int(5 * urgency) + (3 if tick_intensity > 0 else 0)
-            for i in range(num_center_layers):
-                offset_x = random.uniform(-0.8, 0.8)
-                offset_y = random.uniform(-0.8, 0.8)
 
-                cr.new_path()
-                cr.move_to(x + offset_x, y + offset_y)
-                PangoCairo.layout_path(cr, layout)
-
-                # Bright strokes should be more visible, independent of base_opacity
-                bright_opacity = random.uniform(0.15, 0.35) * pulse * urgency
-                if tick_intensity > 0:
-                    bright_opacity *= 1.8  # Extra bright on tick
-
-                # Mix in some orange for a fiery look at high urgency
-                bright_r = r
-                bright_g = g + (0.3 * urgency) if urgency > 0.8 else g
-
-                cr.set_source_rgba(bright_r, bright_g, b, bright_opacity)
-                cr.set_line_width(random.uniform(0.3, 0.7))
-                cr.stroke()
+            # Columns: offset_x, offset_y, line_width, opacity
+            layers = self._rng.random((num_center_layers, 4))
+            layers[:, :2] *= 1.6
+            layers[:, :2] -= 0.8
+            layers[:, 2] *= 0.4
+            layers[:, 2] += 0.3
+
+            # Bright strokes should be more visible, independent of base_opacity
+            bright_scale = urgency
+            if tick_intensity > 0:
+                bright_scale *= 1.8  # Extra bright on tick
+            layers[:, 3] *= 0.2
+            layers[:, 3] += 0.15
+            layers[:, 3] *= bright_scale
+            self._bucket_line_widths(layers)
+
+            # Mix in some orange for a fiery look at high urgency
+            bright_r = r
+            bright_g = g + (0.3 * urgency) if urgency > 0.8 else g
+
+            current_width = None
+            for offset_x, offset_y, line_width, opacity in layers.tolist():
+                if line_width != current_width:
+                    text_cr.set_line_width(line_width)
+                    current_width = line_width
+                text_cr.save()
+                text_cr.translate(x + offset_x, y + offset_y)
+                text_cr.append_path(text_path)
+                text_cr.set_source_rgba(bright_r, bright_g, b, opacity)
+                text_cr.stroke()
+                text_cr.restore()
+
+        return surface
+
+    @staticmethod
+    def _bucket_line_widths(layers):
+        """Round a layer table's line widths to 0.1px buckets and sort rows by them, in place"""
+        np.round(layers[:, 2], 1, out=layers[:, 2])
+        layers[:] = layers[np.argsort(layers[:, 2], kind='stable')]
 
     def load_config(self):
         """Load configuration from config.json"""
@@ -927,110 +1306,111 @@ class InTimeWidget(Gtk.Window):
 
         # Try user config first
         try:
-            if os.path.exists(user_config_path):
-                with open(user_config_path, 'r') as f:
-                    config = json.load(f)
-                    print(f"Config loaded from: {user_config_path}")
-                    # Merge with defaults to handle missing keys
-                    return {**default_config, **config}
+            config = self._read_config_file(user_config_path)
+            if config is not None:
+                print(f"Config loaded from: {user_config_path}")
+                # Merge with defaults to handle missing keys
+                return {**default_config, **config}
         except Exception as e:
             print(f"Error loading user config: {e}")
 
         # Try repo example config
         try:
-            if os.path.exists(repo_config_path):
-                with open(repo_config_path, 'r') as f:
-                    config = json.load(f)
-                    print(f"Config loaded from: {repo_config_path}")
-                    # Merge with defaults to handle missing keys
-                    return {**default_config, **config}
+            config = self._read_config_file(repo_config_path)
+            if config is not None:
+                print(f"Config loaded from: {repo_config_path}")
+                # Merge with defaults to handle missing keys
+                return {**default_config, **config}
         except Exception as e:
             print(f"Error loading repo config: {e}")
 
         print("Using default configuration")
         return default_config
 
-    def setup_css(self):
-        """Set up CSS for styling and transparency"""
-        css_provider = Gtk.CssProvider()
+    def _read_config_file(self, path):
+        """
+        Parse a JSON config file, reusing the last result while the file is unchanged
+        Returns: dict, or None if the file doesn't exist
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
 
-        # CSS with configurable color and transparency
-        color = self.config.get('color', '#FFFFFF')
-        font_size = self.config.get('font_size', 48)
+        # mtime alone misses edits within the timestamp granularity and replacements that keep it
+        file_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = InTimeWidget._config_cache.get(path)
+        if cached is not None and cached[0] == file_key:
+            return cached[1]
 
-        css = """
-        * {
-            background-color: rgba(0, 0, 0, 0);
-            background-image: none;
-            background: none;
-        }
+        with open(path, 'r') as f:
+            config = json.load(f)
+        InTimeWidget._config_cache[path] = (file_key, config)
+        return config
 
-        window,
-        window.background {
-            background-color: rgba(0, 0, 0, 0);
-            background-image: none;
-            background: none;
-            border: none;
-            box-shadow: none;
-        }
-
-        drawingarea {
-            background-color: rgba(0, 0, 0, 0);
-            background-image: none;
-            background: none;
-        }
-        """
+    def setup_css(self):
+        """Set up CSS for styling and transparency"""
+        # The stylesheet doesn't depend on config (text color and size are drawn with cairo),
+        # so the provider only has to be attached to each display once
+        display = self.get_display()
+        if display in InTimeWidget._css_displays:
+            return
 
-        css_provider.load_from_string(css)
+        if InTimeWidget._css_provider is None:
+            InTimeWidget._css_provider = Gtk.CssProvider()
+            InTimeWidget._css_provider.load_from_string(InTimeWidget._CSS)
 
         # Apply CSS with maximum priority to override all themes
         Gtk.StyleContext.add_provider_for_display(
-            self.get_display(),
-            css_provider,
+            display,
+            InTimeWidget._css_provider,
             Gtk.STYLE_PROVIDER_PRIORITY_USER
         )
+        InTimeWidget._css_displays.add(display)
 
     # ===== IPC Command Handlers =====
 
-    def _handle_reload_config_command(self, args):
-        """Handle reload_config IPC command - reload configuration from config.json"""
-        try:
-            # Reload config from file
-            self.config = self.load_config()
-
-            # Update CSS with new config
-            GLib.idle_add(self.setup_css)
-
-            # Force redraw
-            GLib.idle_add(self.drawing_area.queue_draw)
-
-            return json.dumps({"status": "success", "message": "Config reloaded. Restart overlay to apply position changes."})
-        except Exception as e:
-            return json.dumps({"status": "error", "message": str(e)})
+    def _apply_config(self, config):
+        """Apply an already-loaded configuration to this instance"""
+        self.config = config
+        self._color_rgb = self._parse_color(self.config.get('color', '#00FF00'))
+
+        # Force redraw
+        GLib.idle_add(self.drawing_area.queue_draw)
+
+    def _process_screen_color(self, sampled_hex_color):
+        """Apply hybrid complementary + contrast processing to a sample (monitor worker thread)"""
+        # Get background color from config (default to black)
+        bg_color = self.config.get('background_color', '#000000')
+        return self._color_processor.process_color(
+            sampled_hex=sampled_hex_color,
+            background_hex=bg_color,
+            min_contrast_ratio=3.0
+        )
 
-    def _on_screen_color_change(self, sampled_hex_color):
+    def _on_screen_color_change(self, sampled_hex_color, final_color):
         """
         Handle screen color change event from real-time screen sampling.
-        Applies hybrid complementary + contrast processing.
+        Receives the sample along with its processed color (see _process_screen_color).
         """
         try:
-            # Get background color from config (default to black)
-            bg_color = self.config.get('background_color', '#000000')
-
-            # Process color using hybrid approach (complementary + contrast)
-            final_color = HybridColorProcessor.process_color(
-                sampled_hex=sampled_hex_color,
-                background_hex=bg_color,
-                min_contrast_ratio=3.0
-            )
+            # Drop samples that arrive right after the last one with an imperceptible change
+            value = int(sampled_hex_color[1:7], 16)
+            rgb = (value >> 16, (value >> 8) & 0xFF, value & 0xFF)
+            now = time.monotonic()
+            if self._last_color_rgb is not None and now - self._last_color_ts < _SCREEN_COLOR_DEBOUNCE:
+                last_r, last_g, last_b = self._last_color_rgb
+                delta_sq = (rgb[0] - last_r) ** 2 + (rgb[1] - last_g) ** 2 + (rgb[2] - last_b) ** 2
+                if delta_sq < _SCREEN_COLOR_MIN_DELTA ** 2:
+                    return
+            self._last_color_ts = now
+            self._last_color_rgb = rgb
 
             print(f"ScreenColorMonitor: Sampled {sampled_hex_color} -> Processed {final_color}")
 
             # Update config
             self.config['color'] = final_color
-
-            # Update CSS
-            GLib.idle_add(self.setup_css)
+            self._color_rgb = self._parse_color(final_color)
 
             # Force redraw
             GLib.idle_add(self.drawing_area.queue_draw)
@@ -1078,31 +1458,48 @@ class InTimeWidget(Gtk.Window):
     def _handle_forbidden_alarm_command(self, args):
         """Handle forbidden_alarm IPC command - trigger intense alarm visual"""
         try:
-            # Parse args: "window_class|window_title|message"
-            if args:
-                parts = args.split('|', 2)
-                self.forbidden_window_class = parts[0] if len(parts) > 0 else ""
-                self.forbidden_window_title = parts[1] if len(parts) > 1 else ""
-                self.forbidden_alarm_message = parts[2] if len(parts) > 2 else "This window is forbidden!"
-            else:
-                self.forbidden_alarm_message = "This window is forbidden!"
-
-            # Activate alarm
-            self.forbidden_alarm_active = True
-            self.alarm_intensity = 0.0  # Will ramp up in animation
-
-            # Start alarm animation timer if not already running
-            if not self.alarm_animation_timer_running:
-                # Reduced from 50ms to 100ms (10fps instead of 20fps) for better performance
-                self.alarm_animation_timer_id = GLib.timeout_add(100, self.update_alarm_animation)
-                self.alarm_animation_timer_running = True
-
-            print(f"Forbidden alarm activated: {self.forbidden_alarm_message}")
+            self._activate_forbidden_alarm(*self._parse_forbidden_alarm_args(args))
 
             return json.dumps({"success": True, "message": "Alarm activated"})
         except Exception as e:
             return json.dumps({"success": False, "message": str(e)})
 
+    @staticmethod
+    def _parse_forbidden_alarm_args(args):
+        """
+        Parse forbidden_alarm args: "window_class|window_title|message"
+        Returns: (window_class, window_title, message); class/title are None when no args were given
+        """
+        if not args:
+            return None, None, "This window is forbidden!"
+
+        parts = args.split('|', 2)
+        return (parts[0],
+                parts[1] if len(parts) > 1 else "",
+                parts[2] if len(parts) > 2 else "This window is forbidden!")
+
+    def _activate_forbidden_alarm(self, window_class, window_title, message):
+        """Start the forbidden alarm on this instance with already-parsed args"""
+        if window_class is not None:
+            self.forbidden_window_class = window_class
+            self.forbidden_window_title = window_title
+        self.forbidden_alarm_message = message
+
+        # Pre-render the message so the first alarm frame only has to blit it
+        self._get_alarm_message_surface()
+
+        # Activate alarm
+        self.forbidden_alarm_active = True
+        self.alarm_intensity = 0.0  # Will ramp up in animation
+
+        # Start alarm animation timer if not already running
+        if not self.alarm_animation_timer_running:
+            # Reduced from 50ms to 100ms (10fps instead of 20fps) for better performance
+            self.alarm_animation_timer_id = GLib.timeout_add(100, self.update_alarm_animation)
+            self.alarm_animation_timer_running = True
+
+        print(f"Forbidden alarm activated: {self.forbidden_alarm_message}")
+
     def _handle_dismiss_alarm_command(self, args):
         """Handle dismiss_alarm IPC command - turn off alarm"""
         try:
@@ -1124,7 +1521,7 @@ class InTimeWidget(Gtk.Window):
                 # Reset to clock mode
                 self.mode = 'clock'
                 self.duration_seconds = None
-                self.end_time = None
+                self.end_ts = None
                 self.is_flashing = False
 
                 # Dismiss any active alarms
@@ -1150,32 +1547,65 @@ class InTimeWidget(Gtk.Window):
     # ===== Broadcast IPC Handlers (for multi-monitor support) =====
 
     def _handle_reload_config_command_broadcast(self, args):
-        """Broadcast reload_config to all widget instances"""
-        result = None
-        for instance in InTimeWidget._all_instances:
-            result = instance._handle_reload_config_command(args)
-        return result if result else json.dumps({"status": "error", "message": "No instances available"})
+        """Broadcast reload_config to all widget instances (config is parsed once for all of them)"""
+        if not InTimeWidget._all_instances:
+            return json.dumps({"status": "error", "message": "No instances available"})
+
+        try:
+            config = self.load_config()
+            primary, *others = InTimeWidget._all_instances
+            # Each instance gets its own copy (screen sampling rewrites 'color' per monitor)
+            primary._apply_config(dict(config))
+            for other in others:
+                GLib.idle_add(self._run_once, other._apply_config, dict(config))
+
+            return json.dumps({"status": "success", "message": "Config reloaded. Restart overlay to apply position changes."})
+        except Exception as e:
+            return json.dumps({"status": "error", "message": str(e)})
 
     def _handle_forbidden_alarm_command_broadcast(self, args):
-        """Broadcast forbidden_alarm to all widget instances"""
-        result = None
-        for instance in InTimeWidget._all_instances:
-            result = instance._handle_forbidden_alarm_command(args)
-        return result if result else json.dumps({"success": False, "message": "No instances available"})
+        """Broadcast forbidden_alarm to all widget instances (args are parsed once for all of them)"""
+        if not InTimeWidget._all_instances:
+            return json.dumps({"success": False, "message": "No instances available"})
+
+        try:
+            parsed_args = self._parse_forbidden_alarm_args(args)
+            primary, *others = InTimeWidget._all_instances
+            primary._activate_forbidden_alarm(*parsed_args)
+            for other in others:
+                GLib.idle_add(self._run_once, other._activate_forbidden_alarm, *parsed_args)
+
+            return json.dumps({"success": True, "message": "Alarm activated"})
+        except Exception as e:
+            return json.dumps({"success": False, "message": str(e)})
 
     def _handle_dismiss_alarm_command_broadcast(self, args):
         """Broadcast dismiss_alarm to all widget instances"""
-        result = None
-        for instance in InTimeWidget._all_instances:
-            result = instance._handle_dismiss_alarm_command(args)
-        return result if result else json.dumps({"success": False, "message": "No instances available"})
+        return self._broadcast_command('_handle_dismiss_alarm_command', args)
 
     def _handle_reset_deadline_command_broadcast(self, args):
         """Broadcast reset_deadline to all widget instances"""
-        result = None
-        for instance in InTimeWidget._all_instances:
-            result = instance._handle_reset_deadline_command(args)
-        return result if result else json.dumps({"success": False, "message": "No instances available"})
+        return self._broadcast_command('_handle_reset_deadline_command', args)
+
+    def _broadcast_command(self, handler_name, args):
+        """
+        Run a per-instance handler on the first instance and reply with its result;
+        the other instances run it from the main loop after the IPC reply has been sent
+        """
+        if not InTimeWidget._all_instances:
+            return json.dumps({"success": False, "message": "No instances available"})
+
+        primary, *others = InTimeWidget._all_instances
+        result = getattr(primary, handler_name)(args)
+        for other in others:
+            GLib.idle_add(self._run_once, getattr(other, handler_name), args)
+        return result
+
+    @staticmethod
+    def _run_once(func, *args):
+        """Idle callback wrapper that discards func's return value (handlers return truthy JSON strings)"""
+        func(*args)
+        return False
 
     # ===== Animation and Update Functions =====
 
@@ -1185,21 +1615,38 @@ class InTimeWidget(Gtk.Window):
         if self.is_flashing:
             self.flash_state = not self.flash_state
 
-        self.drawing_area.queue_draw()
+        # Only redraw when the visible text or flash state changed since the last frame
+        # (animation timers may already have drawn the new second)
+        if (self._format_time_str(), self.flash_state) != self._last_rendered_params:
+            self.drawing_area.queue_draw()
         return True  # Continue the timeout
 
     def update_animation(self):
         """Update animation frame for light bulb and deadline effects"""
         self.animation_frame += 1
 
+        # Pulses read by the draw methods, computed once per tick instead of once per draw
+        frame = self.animation_frame
+        self._lightbulb_pulse = 0.85 + 0.15 * _lut_sin(frame * 0.08)
+        self._alarm_pulse = 0.7 + 0.3 * _lut_sin(frame * 0.2)
+        self._msg_pulse = 0.8 + 0.2 * _lut_sin(frame * 0.15)
+
         # Update deadline mode animation
         if self.mode == 'deadline':
             self.deadline_pulse_frame += 1
             # Reset tick state after brief moment (about 100ms / 2 frames at 50ms interval)
             if self.deadline_tick_state and self.deadline_pulse_frame % 2 == 0:
                 self.deadline_tick_state = False
+            pulse = _lut_sin(self.deadline_pulse_frame * self._last_pulse_speed)
+        else:
+            pulse = _lut_sin(frame * 0.08)
 
-        self.drawing_area.queue_draw()
+        # Only redraw when something visible moved: text, pulse bucket, tick or alarm intensity
+        signature = (self._format_time_str(), int(pulse * _PULSE_BUCKETS),
+                     self.deadline_tick_state, int(self.alarm_intensity * 10))
+        if signature != self._last_animation_signature:
+            self._last_animation_signature = signature
+            self.drawing_area.queue_draw()
         return True  # Continue the timeout
 
     def update_alarm_animation(self):
@@ -1212,13 +1659,22 @@ class InTimeWidget(Gtk.Window):
             # Update wave offset for expanding circles
             self.alarm_wave_offset = (self.alarm_wave_offset + 5) % 200
 
-            # Update shake offset for jitter effect
-            import random
-            shake_magnitude = 3 * self.alarm_intensity  # Shake more as intensity increases
-            self.alarm_shake_offset = (
-                random.randint(-int(shake_magnitude), int(shake_magnitude)),
-                random.randint(-int(shake_magnitude), int(shake_magnitude))
-            )
+            # Update shake offset for jitter effect (new jitter every other frame is plenty)
+            self.alarm_frame += 1
+            if self.alarm_frame % 2 == 0:
+                shake_magnitude = int(3 * self.alarm_intensity)  # Shake more as intensity increases
+                if shake_magnitude > 0:
+                    # One 32-bit LCG step feeds both axes from disjoint high bytes
+                    # (the low bits of an LCG have short periods)
+                    state = (self._lcg_state * 1103515245 + 12345) & 0xFFFFFFFF
+                    self._lcg_state = state
+                    span = 2 * shake_magnitude + 1
+                    self.alarm_shake_offset = (
+                        (((state >> 16) & 0xFF) % span) - shake_magnitude,
+                        ((state >> 24) % span) - shake_magnitude
+                    )
+                else:
+                    self.alarm_shake_offset = (0, 0)
 
             # Force redraw
             self.drawing_area.queue_draw()
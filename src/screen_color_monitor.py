@@ -4,13 +4,158 @@ Real-Time Screen Color Monitor for Hyprland
 Samples screen content and extracts dominant colors dynamically
 """
 
+import os
 import subprocess
-import io
-import colorsys
-from PIL import Image
+import functools
+import json
+import socket
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from gi.repository import GLib
 
+# Width (px) grim downscales the sample region to before it's averaged
+# grim scales with a bilinear filter, not a box average, so the result is a sparse estimate of the
+# full-resolution mean: each output pixel blends ~2x2 source pixels out of a ~12x12 cell.
+# Smooth content (gradients, wallpapers) matches to well under 1 unit per channel; dense
+# high-contrast text drifts by ~3 units typically and up to ~12 in the worst case (simulated on a
+# 192x108 region). That stays below the default throttle_threshold of 15, so it shows up as at
+# most one extra or skipped color update, not as a wrong clock color.
+_SAMPLE_TARGET_WIDTH = 16
+
+_CAPTURE_TIMEOUT = 0.5  # Seconds allowed for one grim capture
+
+# Monitor hotplug events on Hyprland's event socket that change the sample geometry
+_MONITOR_EVENTS = (b'monitoradded', b'monitorremoved')
+
+# BT.709 luminance weights with the /255 normalization folded in
+_LUM_R_255 = 0.2126 / 255.0
+_LUM_G_255 = 0.7152 / 255.0
+_LUM_B_255 = 0.0722 / 255.0
+
+
+def _hyprland_socket_path(name):
+    """Path of a Hyprland IPC socket ('.socket.sock' or '.socket2.sock'), or None if not found"""
+    signature = os.environ.get('HYPRLAND_INSTANCE_SIGNATURE')
+    if not signature:
+        return None
+
+    # Current Hyprland keeps its sockets under XDG_RUNTIME_DIR, older releases under /tmp
+    bases = ['/tmp/hypr']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        bases.insert(0, os.path.join(runtime_dir, 'hypr'))
+
+    for base in bases:
+        path = os.path.join(base, signature, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _luminance(rgb):
+    """Relative luminance of a 0-255 RGB triple (ITU-R BT.709)"""
+    r, g, b = rgb
+    return _LUM_R_255 * r + _LUM_G_255 * g + _LUM_B_255 * b
+
+
+def _contrast_ratio(rgb1, rgb2):
+    """WCAG contrast ratio between two 0-255 RGB triples"""
+    lum1 = _luminance(rgb1)
+    lum2 = _luminance(rgb2)
+
+    lighter = max(lum1, lum2)
+    darker = min(lum1, lum2)
+
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def _process_rgb(sampled_rgb, min_contrast_ratio):
+    """
+    Color kernel behind HybridColorProcessor.process_color (plain numbers in, tuple out)
+    Returns: (r, g, b) 0-255 tuple with complementary hue, contrast ensured against sampled_rgb
+    """
+    # Calculate screen luminance
+    screen_luminance = _luminance(sampled_rgb)
+
+    # Get hue and saturation of sampled color (same math as colorsys.rgb_to_hsv, value isn't needed)
+    r, g, b = sampled_rgb
+    r, g, b = r / 255.0, g / 255.0, b / 255.0
+    max_c = max(r, g, b)
+    range_c = max_c - min(r, g, b)
+    if range_c == 0.0:
+        h = s = 0.0
+    else:
+        s = range_c / max_c
+        rc = (max_c - r) / range_c
+        gc = (max_c - g) / range_c
+        bc = (max_c - b) / range_c
+        if r == max_c:
+            h = bc - gc
+        elif g == max_c:
+            h = 2.0 + rc - bc
+        else:
+            h = 4.0 + gc - rc
+        h = (h / 6.0) % 1.0
+
+    # Calculate complementary hue (180 degrees)
+    h_comp = (h + 0.5) % 1.0
+
+    # Adjust value (brightness) based on screen luminance to ensure contrast
+    # Dark screen → bright clock, Bright screen → dark clock
+    if screen_luminance < 0.5:
+        # Dark screen detected - make clock BRIGHT
+        v_target = 0.95  # Very bright
+        s_target = max(0.6, s)  # Keep saturation decent
+    else:
+        # Bright screen detected - make clock DARK
+        v_target = 0.3  # Dark but not black
+        s_target = max(0.7, s)  # Keep saturation high for visibility
+
+    # Create final color with complementary hue and adjusted brightness
+    # HSV -> RGB by hue sextant (s_target is never 0, so there's no grey special case)
+    sextant = int(h_comp * 6.0)
+    f = h_comp * 6.0 - sextant
+    p = int(v_target * (1.0 - s_target) * 255)
+    q = int(v_target * (1.0 - s_target * f) * 255)
+    t = int(v_target * (1.0 - s_target * (1.0 - f)) * 255)
+    v = int(v_target * 255)
+    if sextant == 0:
+        final_rgb = (v, t, p)
+    elif sextant == 1:
+        final_rgb = (q, v, p)
+    elif sextant == 2:
+        final_rgb = (p, v, t)
+    elif sextant == 3:
+        final_rgb = (p, q, v)
+    elif sextant == 4:
+        final_rgb = (t, p, v)
+    else:
+        final_rgb = (v, p, q)
+
+    # If still not enough contrast, force to pure white or black
+    if _contrast_ratio(final_rgb, sampled_rgb) < min_contrast_ratio:
+        if screen_luminance < 0.5:
+            # Dark screen - force white
+            final_rgb = (255, 255, 255)
+        else:
+            # Bright screen - force black
+            final_rgb = (0, 0, 0)
+
+    return final_rgb
+
+
+@functools.lru_cache(maxsize=4096)
+def _process_quantized(q_rgb, min_contrast_ratio):
+    """
+    Cached _process_rgb for a 5-bit-per-channel color (15-bit key: rrrrrgggggbbbbb)
+    Channels are expanded back to 8 bits by bit replication, so 0 and 255 stay exact
+    Returns: processed hex color string
+    """
+    q_r, q_g, q_b = q_rgb >> 10, (q_rgb >> 5) & 0x1F, q_rgb & 0x1F
+    sampled_rgb = ((q_r << 3) | (q_r >> 2), (q_g << 3) | (q_g >> 2), (q_b << 3) | (q_b >> 2))
+    r, g, b = _process_rgb(sampled_rgb, min_contrast_ratio)
+    return f'#{(r << 16) | (g << 8) | b:06x}'
+
 
 class ScreenColorMonitor:
     """
@@ -18,40 +163,45 @@ class ScreenColorMonitor:
     Samples center region of screen at configurable intervals.
     """
 
-    def __init__(self, callback, update_interval=0.5, throttle_threshold=15):
+    def __init__(self, callback, update_interval=0.5, throttle_threshold=15, processor=None):
         """
         Initialize screen color monitor.
 
         Args:
-            callback: Function to call with new color (receives hex color string)
+            callback: Function to call with new color (receives hex color string, plus the
+                      processor's result when a processor is given)
             update_interval: Seconds between samples (default: 0.5s for 2 FPS)
             throttle_threshold: Minimum RGB distance to trigger update (default: 15)
+            processor: Optional function run on the capture worker with each new hex color
         """
         self.callback = callback
+        self.processor = processor
         self.update_interval = update_interval
         self.throttle_threshold = throttle_threshold
-        self.last_color = None
+        self._threshold_sq = throttle_threshold ** 2
+        self.last_color = None  # int32 RGB array of the last reported sample
         self.timer_id = None
         self.enabled = False
-
-        # Screen dimensions (will be detected from hyprctl)
+        # Captures run on one worker thread (kept for the monitor's lifetime, so stop/start
+        # can't leave two workers running) - a slow grim never blocks the GTK main loop
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None  # Future of the capture in flight
+        self._event_socket = None  # Hyprland event socket, watched while sampling for monitor hotplug
+        self._event_watch_id = None
+        self._event_buffer = b''
+
+        # Screen dimensions (will be detected from Hyprland)
         self.monitor_width = 1920
         self.monitor_height = 1080
         self._detect_screen_size()
 
     def _detect_screen_size(self):
-        """Detect screen resolution from hyprctl"""
+        """Detect screen resolution from Hyprland"""
         try:
-            result = subprocess.run(
-                ['hyprctl', 'monitors', '-j'],
-                capture_output=True,
-                timeout=1.0,
-                text=True
-            )
-
-            if result.returncode == 0:
-                import json
-                monitors = json.loads(result.stdout)
+            monitors_json = self._query_monitors()
+
+            if monitors_json:
+                monitors = json.loads(monitors_json)
                 if monitors:
                     # Use first monitor for now
                     self.monitor_width = monitors[0]['width']
@@ -60,6 +210,107 @@ class ScreenColorMonitor:
         except Exception as e:
             print(f"ScreenColorMonitor: Could not detect screen size, using defaults: {e}")
 
+        self._update_geometry()
+
+    def _query_monitors(self):
+        """Get the monitor list as JSON from Hyprland's request socket, falling back to hyprctl"""
+        path = _hyprland_socket_path('.socket.sock')
+        if path:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(1.0)
+                    sock.connect(path)
+                    sock.sendall(b'j/monitors')
+
+                    # Hyprland closes the connection after the reply
+                    chunks = []
+                    while True:
+                        chunk = sock.recv(65536)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                return b''.join(chunks)
+            except OSError as e:
+                print(f"ScreenColorMonitor: Hyprland socket query failed, trying hyprctl: {e}")
+
+        result = subprocess.run(
+            ['hyprctl', 'monitors', '-j'],
+            capture_output=True,
+            timeout=1.0
+        )
+        return result.stdout if result.returncode == 0 else None
+
+    def _watch_monitor_events(self):
+        """Subscribe to Hyprland's event socket so monitor hotplug refreshes the sample geometry"""
+        path = _hyprland_socket_path('.socket2.sock')
+        if path is None or self._event_socket is not None:
+            return
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+        except OSError as e:
+            print(f"ScreenColorMonitor: Could not watch monitor events: {e}")
+            sock.close()
+            return
+
+        sock.setblocking(False)
+        self._event_socket = sock
+        self._event_buffer = b''
+        self._event_watch_id = GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT,
+            sock.fileno(),
+            GLib.IOCondition.IN,
+            self._on_hypr_event
+        )
+
+    def _unwatch_monitor_events(self):
+        """Stop watching Hyprland events"""
+        if self._event_watch_id:
+            GLib.source_remove(self._event_watch_id)
+            self._event_watch_id = None
+        if self._event_socket is not None:
+            self._event_socket.close()
+            self._event_socket = None
+
+    def _on_hypr_event(self, fd, condition):
+        """Handle "EVENT>>DATA" lines from Hyprland's event socket"""
+        try:
+            data = self._event_socket.recv(65536)
+        except BlockingIOError:
+            return True
+        except OSError:
+            data = b''
+
+        if not data:
+            # Hyprland went away - drop the watch
+            self._event_watch_id = None
+            self._event_socket.close()
+            self._event_socket = None
+            return False
+
+        lines = (self._event_buffer + data).split(b'\n')
+        self._event_buffer = lines.pop()  # Keep a partial trailing line for the next read
+        if any(line.startswith(_MONITOR_EVENTS) for line in lines):
+            # Re-query on the worker - the socket round trip (or hyprctl fallback) mustn't block the main loop
+            self._executor.submit(self._detect_screen_size)
+        return True
+
+    def _update_geometry(self):
+        """Recompute the grim (region, scale) strings (call whenever the monitor size changes)"""
+        # Center 10% region geometry
+        sample_w = int(self.monitor_width * 0.10)
+        sample_h = int(self.monitor_height * 0.10)
+        cx = self.monitor_width // 2
+        cy = self.monitor_height // 2
+
+        geometry = f"{cx - sample_w//2},{cy - sample_h//2} {sample_w}x{sample_h}"
+        # Only the average is needed, so let grim shrink the region to a few hundred pixels
+        scale = f"{min(1.0, _SAMPLE_TARGET_WIDTH / sample_w):.4f}"
+
+        # Published as one tuple so a capture never mixes region and scale from different sizes
+        self._capture_region = (geometry, scale)
+
     def start(self):
         """Start periodic screen sampling"""
         if self.enabled:
@@ -67,13 +318,14 @@ class ScreenColorMonitor:
             return
 
         self.enabled = True
+        self._watch_monitor_events()
         # Convert seconds to milliseconds for GLib
         interval_ms = int(self.update_interval * 1000)
         self.timer_id = GLib.timeout_add(interval_ms, self._sample_and_update)
         print(f"ScreenColorMonitor: Started (sampling every {self.update_interval}s)")
 
         # Do immediate first sample
-        GLib.idle_add(self._sample_and_update)
+        self._request_sample()
 
     def stop(self):
         """Stop sampling"""
@@ -84,6 +336,8 @@ class ScreenColorMonitor:
         if self.timer_id:
             GLib.source_remove(self.timer_id)
             self.timer_id = None
+        # A capture still in flight finishes on the worker; _deliver drops its result
+        self._unwatch_monitor_events()
         print("ScreenColorMonitor: Stopped")
 
     def toggle(self):
@@ -102,66 +356,95 @@ class ScreenColorMonitor:
     def trigger_immediate_sample(self):
         """Force immediate sample (called on Hyprland events)"""
         if self.enabled:
-            GLib.idle_add(self._sample_and_update)
+            self._request_sample()
 
     def _sample_and_update(self):
-        """Capture screen region and extract color"""
+        """Timer tick: request a capture on the worker thread"""
         if not self.enabled:
             return False  # Stop timer
 
+        self._request_sample()
+        return True  # Continue timer
+
+    def _request_sample(self):
+        """Submit one capture to the worker, unless the previous one is still running"""
+        if self._pending is None or self._pending.done():
+            self._pending = self._executor.submit(self._capture_sample)
+
+    def _capture_sample(self):
+        """Capture screen region and extract color (worker thread)"""
         try:
-            # Calculate center 10% region geometry
-            sample_w = int(self.monitor_width * 0.10)
-            sample_h = int(self.monitor_height * 0.10)
-            cx = self.monitor_width // 2
-            cy = self.monitor_height // 2
-
-            geometry = f"{cx - sample_w//2},{cy - sample_h//2} {sample_w}x{sample_h}"
-
-            # Capture screenshot using grim
-            result = subprocess.run(
-                ['grim', '-g', geometry, '-t', 'png', '-'],
-                capture_output=True,
-                timeout=0.5
-            )
-
-            if result.returncode != 0:
+            # Capture screenshot using grim as raw PPM (no compression, no image decoder needed)
+            color_array = self._capture(*self._capture_region)
+
+            if color_array is None:
                 print(f"ScreenColorMonitor: grim capture failed")
-                return True  # Continue timer
+                return
 
-            # Load image and extract average color
-            img = Image.open(io.BytesIO(result.stdout)).convert('RGB')
-            color_array = np.array(img)
-            avg_color = tuple(color_array.mean(axis=(0,1)).astype(int))
+            # Extract average color (integer sum and floor divide - same result as mean() truncated)
+            avg_color = color_array.sum(axis=0, dtype=np.int32) // len(color_array)
 
             # Throttle: only update if color changed significantly
             if self._should_update(avg_color):
                 self.last_color = avg_color
 
                 # Convert to hex
-                hex_color = '#{:02x}{:02x}{:02x}'.format(*avg_color[:3])
+                r, g, b = avg_color.tolist()
+                hex_color = f'#{(r << 16) | (g << 8) | b:06x}'
 
-                # Trigger callback with new color
-                self.callback(hex_color)
+                # Post-process on this worker, then trigger callback on the main thread
+                results = (hex_color,)
+                if self.processor is not None:
+                    results += (self.processor(hex_color),)
+                GLib.idle_add(self._deliver, *results)
 
         except subprocess.TimeoutExpired:
             print("ScreenColorMonitor: Capture timeout")
         except Exception as e:
             print(f"ScreenColorMonitor: Error sampling: {e}")
 
-        return True  # Continue timer
+    def _deliver(self, *results):
+        """Pass a sampled color to the callback (idle callback on the main thread, runs once)"""
+        if self.enabled:
+            self.callback(*results)
+        return False
+
+    def _capture(self, geometry, scale):
+        """
+        Capture a region with grim as raw PPM
+        Returns: (width * height, 3) uint8 array of packed RGB pixels, or None if grim failed
+        Raises: subprocess.TimeoutExpired if grim takes longer than _CAPTURE_TIMEOUT
+        """
+        result = subprocess.run(
+            ['grim', '-g', geometry, '-s', scale, '-t', 'ppm', '-'],
+            capture_output=True,
+            timeout=_CAPTURE_TIMEOUT
+        )
+
+        if result.returncode != 0:
+            return None
+
+        # grim writes the header as "P6\n<width> <height>\n255\n"
+        data = result.stdout
+        size_end = data.index(b'\n', 3)
+        width, height = map(int, data[3:size_end].split())
+        header_end = data.index(b'\n', size_end + 1) + 1
+
+        # View grim's output without copying; only the average is taken, so keep pixels flat
+        return np.frombuffer(data, dtype=np.uint8, count=width * height * 3,
+                             offset=header_end).reshape(-1, 3)
 
     def _should_update(self, new_color):
         """
         Check if color changed enough to warrant update.
-        Uses Euclidean distance in RGB space.
+        Uses Euclidean distance in RGB space (compared squared, no sqrt).
         """
         if self.last_color is None:
             return True
 
-        # Calculate RGB distance
-        distance = sum((a - b) ** 2 for a, b in zip(new_color, self.last_color)) ** 0.5
-        return distance > self.throttle_threshold
+        # Squared RGB distance
+        diff = new_color - self.last_color
+        return int(diff @ diff) > self._threshold_sq
 
 
 class HybridColorProcessor:
@@ -170,8 +453,11 @@ class HybridColorProcessor:
     Ensures colors are both vibrant (complementary) and readable (high contrast).
     """
 
-    @staticmethod
-    def process_color(sampled_hex, background_hex='#000000', min_contrast_ratio=4.5):
+    # Last (sampled_hex, min_contrast_ratio, result) - repeated samples skip all processing
+    _last = (None, None, None)
+
+    @classmethod
+    def process_color(cls, sampled_hex, background_hex='#000000', min_contrast_ratio=4.5):
         """
         Process sampled screen color using hybrid approach.
         Ensures clock color contrasts with the SAMPLED SCREEN COLOR (not config background).
@@ -184,68 +470,32 @@ class HybridColorProcessor:
         Returns:
             Processed hex color (complementary with contrast ensured against screen)
         """
-        # Convert sampled color to RGB
-        sampled_rgb = HybridColorProcessor._hex_to_rgb(sampled_hex)
-
-        # Calculate screen luminance
-        screen_luminance = HybridColorProcessor._calculate_luminance(sampled_rgb)
+        last_hex, last_ratio, last_result = cls._last
+        if sampled_hex == last_hex and min_contrast_ratio == last_ratio:
+            return last_result
 
-        # Get HSV of sampled color
-        r, g, b = [x / 255.0 for x in sampled_rgb]
-        h, s, v = colorsys.rgb_to_hsv(r, g, b)
+        # Convert sampled color to RGB
+        r, g, b = cls._hex_to_rgb(sampled_hex)
 
-        # Calculate complementary hue (180 degrees)
-        h_comp = (h + 0.5) % 1.0
+        # Screen samples jitter by a few units - quantize so near-identical colors hit the cache
+        q_rgb = ((r >> 3) << 10) | ((g >> 3) << 5) | (b >> 3)
+        final_hex = _process_quantized(q_rgb, min_contrast_ratio)
 
-        # Adjust value (brightness) based on screen luminance to ensure contrast
-        # Dark screen → bright clock, Bright screen → dark clock
-        if screen_luminance < 0.5:
-            # Dark screen detected - make clock BRIGHT
-            v_target = 0.95  # Very bright
-            s_target = max(0.6, s)  # Keep saturation decent
-        else:
-            # Bright screen detected - make clock DARK
-            v_target = 0.3  # Dark but not black
-            s_target = max(0.7, s)  # Keep saturation high for visibility
-
-        # Create final color with complementary hue and adjusted brightness
-        r_final, g_final, b_final = colorsys.hsv_to_rgb(h_comp, s_target, v_target)
-        final_rgb = (int(r_final * 255), int(g_final * 255), int(b_final * 255))
-
-        # Verify contrast ratio
-        contrast = HybridColorProcessor._calculate_contrast_ratio(final_rgb, sampled_rgb)
-
-        # If still not enough contrast, force to pure white or black
-        if contrast < min_contrast_ratio:
-            if screen_luminance < 0.5:
-                # Dark screen - force white
-                final_rgb = (255, 255, 255)
-            else:
-                # Bright screen - force black
-                final_rgb = (0, 0, 0)
-
-        final_hex = '#{:02x}{:02x}{:02x}'.format(*final_rgb)
+        cls._last = (sampled_hex, min_contrast_ratio, final_hex)
         return final_hex
 
     @staticmethod
     def _hex_to_rgb(hex_color):
         """Convert hex color to RGB tuple (0-255 range)"""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        value = int(hex_color.lstrip('#'), 16)
+        return (value >> 16, (value >> 8) & 0xFF, value & 0xFF)
 
     @staticmethod
     def _calculate_luminance(rgb):
         """Calculate relative luminance for contrast checking (ITU-R BT.709)"""
-        r, g, b = [x / 255.0 for x in rgb]
-        return 0.2126 * r + 0.7152 * g + 0.0722 * b
+        return _luminance(rgb)
 
     @staticmethod
     def _calculate_contrast_ratio(rgb1, rgb2):
         """Calculate WCAG contrast ratio between two RGB colors"""
-        lum1 = HybridColorProcessor._calculate_luminance(rgb1)
-        lum2 = HybridColorProcessor._calculate_luminance(rgb2)
-
-        lighter = max(lum1, lum2)
-        darker = min(lum1, lum2)
-
-        return (lighter + 0.05) / (darker + 0.05)
+        return _contrast_ratio(rgb1, rgb2)